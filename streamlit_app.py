@@ -1,155 +1,455 @@
 import streamlit as st
-import PyPDF2
+import pymupdf
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from tokenizers import Tokenizer
+from diskcache import Cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import orjson
+import random
 import re
+import threading
 import time
 
-# Set page config
-st.set_page_config(page_title="ATS CV Analyzer", page_icon="📄")
-
 # API Configuration
-HF_API_TOKEN = st.secrets["HF_API_TOKEN"]
-# Try a more reliable model
-HF_MODEL_NAME = "/Plucore/google-flan-t5-xxl"  # Using a larger model that might follow instructions better
-API_URL = f"https://api-inference.huggingface.co/models/{HF_MODEL_NAME}"
-headers = {"Authorization": f"Bearer {HF_API_TOKEN}"}
-
-def extract_text_from_pdf(file):
-    """Extracts text from a PDF file."""
+# The short, focused section prompts don't need an 11B model; the 780M
+# checkpoint loads and decodes several times faster
+HF_MODEL_NAME = "google/flan-t5-large"
+MAX_INPUT_TOKENS = 512  # T5 encoder window
+MAX_PAGES = 8  # A real CV rarely runs past a few pages
+MIN_CV_TOKENS = 32  # Less than this is usually a scanned, image-only PDF
+ANALYSIS_CACHE_DIR = "./.cvcache"
+ANALYSIS_CACHE_TTL = 7 * 86400  # seconds
+# CVs scoring below this on the local structural checks are reported
+# without asking the model
+LOCAL_SCORE_FLOOR = 40
+DEFAULT_API_URL = f"https://api-inference.huggingface.co/models/{HF_MODEL_NAME}"
+
+# Prompt text is kept byte-identical across requests with the CV last, so
+# every request shares the same leading tokens for the provider's prefix cache
+PROMPT_PREAMBLE = "You are an expert in Applicant Tracking Systems (ATS).\n\n"
+SECTION_INSTRUCTIONS = (
+    "Rate how well the CV below would be parsed and ranked by an ATS on a "
+    "scale from 0 to 100. Answer with the number only.",
+    "List three specific problems that would hurt the CV below in an ATS. "
+    "Separate them with semicolons.",
+    "List three specific changes that would improve the CV below for an ATS. "
+    "Separate them with semicolons.",
+)
+
+# Bump when the prompts or report assembly change so cached analyses
+# produced by the old version are no longer served
+PROMPT_VERSION = 1
+
+# Precompiled patterns for text cleanup, report parsing and local checks
+WHITESPACE_RE = re.compile(r"\s+")
+NUMBER_RE = re.compile(r"\d+")
+POINT_SPLIT_RE = re.compile(r"[\n;]|(?<=\.)\s+")
+POINT_PREFIX_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+REPORT_LINE_RE = re.compile(
+    r"^[ \t]*(?:ATS Compliance Score:[ \t]*(?P<score>\d+)"
+    r"|(?P<section>Feedback|Suggestions):"
+    r"|-[ \t]*(?P<bullet>.+?))[ \t]*$",
+    re.MULTILINE,
+)
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_RE = re.compile(
+    r"(?<!\d)(?:\+\d{1,3}[\s.-]?)?(?:\(\d{2,5}\)|\d{2,5})[\s.-]?\d{3,4}[\s.-]?\d{3,4}(?!\d)"
+)
+YEAR_RE = re.compile(r"(?:19|20)\d\d")
+# A heading is an all-caps heading word, or a capitalised one followed by a
+# colon, a capitalised word, a digit or the end of the text, so prose like
+# "5 years of experience in" doesn't count as a heading
+SECTION_RE = re.compile(
+    r"\b(?:(?:EXPERIENCE|EDUCATION|SKILLS|SUMMARY|PROFILE)\b"
+    r"|(?=[A-Z])(?i:experience|education|skills|summary|profile)\b(?=\s*:|\s+[A-Z\d]|\s*$))"
+)
+QUANTIFIED_RE = re.compile(r"\d+(?:\.\d+)?\s*%|[$€£]\s?\d")
+
+def get_api_token():
+    """Return the HF API token from the app's secrets, or None if unset."""
+    try:
+        return st.secrets["HF_API_TOKEN"]
+    except (KeyError, FileNotFoundError):
+        return None
+
+def get_api_url():
+    """Return the inference URL, preferring a dedicated endpoint.
+
+    A dedicated Inference Endpoint (e.g. TGI) avoids the shared API's
+    queueing and cold starts.
+    """
+    return st.secrets.get("HF_ENDPOINT_URL", DEFAULT_API_URL)
+
+@st.cache_resource
+def get_session():
+    """Return a pooled session shared across reruns and user sessions.
+
+    Reusing it lets repeat calls skip the TCP/TLS handshake. Connection
+    errors, rate limits and transient server errors are retried with
+    backoff; the last response is returned so callers still see its status
+    code. Read timeouts are not retried, since a request that already waited
+    out its full timeout would only block the page again; the original
+    ReadTimeout reaches the caller. Self-hosted endpoints are often plain
+    HTTP, so both schemes get the same adapter.
+    """
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=False,
+        status=3,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.headers.update({"Authorization": f"Bearer {get_api_token()}"})
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_resource
+def get_analysis_cache():
+    """Open the on-disk analysis cache shared by all users and restarts."""
+    return Cache(ANALYSIS_CACHE_DIR, size_limit=200 * 1024 * 1024)
+
+def clean_text(text):
+    """Collapse runs of whitespace into single spaces."""
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def extract_text_from_pdf(file_bytes: bytes):
+    """Extracts text from the raw bytes of a PDF file."""
+    # The PDF header may follow a little junk but must be in the first 1 KB
+    if b"%PDF" not in file_bytes[:1024]:
+        st.error("The uploaded file is not a valid PDF.")
+        return None
     try:
-        file.seek(0)  # Reset file pointer
-        reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ""
-        return re.sub(r'\s+', ' ', text).strip()  # Clean the text
+        parts = []
+        with pymupdf.open(stream=file_bytes, filetype="pdf") as doc:
+            if doc.page_count > MAX_PAGES:
+                st.warning(f"Only the first {MAX_PAGES} of {doc.page_count} pages were read.")
+            for page in doc.pages(0, min(doc.page_count, MAX_PAGES)):
+                page_text = page.get_text("text")
+                if page_text:
+                    parts.append(page_text)
+        # Keep a separator so words at page boundaries don't fuse together
+        return clean_text("\n".join(parts))
+    except pymupdf.FileDataError as e:
+        st.error(f"PDF appears to be corrupted: {str(e)}")
+        return None
     except Exception as e:
         st.error(f"PDF extraction error: {str(e)}")
         return None
 
+@st.cache_resource(show_spinner=False)
+def get_tokenizer():
+    """Load the model's tokenizer once per process."""
+    return Tokenizer.from_pretrained(HF_MODEL_NAME)
+
+@st.cache_data(show_spinner=False)
+def get_cv_token_budget():
+    """Tokens left for the CV once the longest section prompt is counted."""
+    tokenizer = get_tokenizer()
+    overhead = max(
+        len(tokenizer.encode(f"{PROMPT_PREAMBLE}{instruction}\n\nCV:\n").ids)
+        for instruction in SECTION_INSTRUCTIONS
+    )
+    return MAX_INPUT_TOKENS - overhead
+
+def truncate_to_token_budget(cv_text, ids):
+    """Trim the CV so the longest section prompt fits the model's input window.
+
+    ``ids`` are the CV's token ids, encoded without special tokens.
+    """
+    budget = get_cv_token_budget()
+    if len(ids) <= budget:
+        return cv_text
+    return get_tokenizer().decode(ids[:budget])
+
+def warm_up_model(session, api_url):
+    """Send a tiny request so the model is loaded before the real analysis."""
+    try:
+        session.post(api_url, json={"inputs": "ping", "parameters": {"max_new_tokens": 1}}, timeout=60)
+    except requests.RequestException:
+        pass  # Best effort only; the analysis reports its own errors
+
+def start_warm_up():
+    """Warm the model on a background thread without blocking the page."""
+    threading.Thread(target=warm_up_model, args=(get_session(), get_api_url()), daemon=True).start()
+
+class UnexpectedResponseError(Exception):
+    """The API answered, but not with one generated text per prompt."""
+
+def read_generated_texts(response):
+    """Return the generated texts in an API response, one per input."""
+    try:
+        result = orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise UnexpectedResponseError("Unexpected response format") from e
+
+    # A single input may come back as a bare dict (TGI's /generate route)
+    if isinstance(result, dict):
+        result = [result]
+
+    # Each input yields a dict, or a one-item list of dicts on some backends
+    try:
+        return [
+            (item[0] if isinstance(item, list) else item)["generated_text"]
+            for item in result
+        ]
+    except (KeyError, IndexError, TypeError) as e:
+        raise UnexpectedResponseError("Unexpected response format") from e
+
+@st.cache_data(show_spinner=False, ttl=86400)
+def query_model(prompts: tuple, model: str, api_url: str):
+    """Send the prompts to the inference API and return the generated texts.
+
+    The shared Inference API gets all prompts in one list-input request.
+    Dedicated endpoints such as TGI only accept a single string input, so
+    they get one concurrent request per prompt and batch them server-side.
+
+    Returns the generated texts in the same order as ``prompts``. ``model``
+    and ``api_url`` are part of the cache key so switching models or
+    endpoints never serves a stale answer. Only successful responses are
+    cached; HTTP errors are raised so that a transient failure is retried on
+    the next click.
+    """
+    session = get_session()
+    parameters = {
+        "max_new_tokens": 120,
+        "temperature": 0.1,
+        "do_sample": False
+    }
+
+    if api_url == DEFAULT_API_URL:
+        payload = {
+            "inputs": list(prompts),
+            "parameters": {**parameters, "num_return_sequences": 1},
+            # Let the server hold the request while a cold model loads instead
+            # of answering 503, and reuse its cached answer for repeat inputs
+            "options": {"wait_for_model": True, "use_cache": True}
+        }
+
+        # Cold loads can take a minute, so allow for them on top of generation
+        response = session.post(api_url, json=payload, timeout=120)
+        response.raise_for_status()
+        texts = read_generated_texts(response)
+    else:
+        def generate(prompt):
+            response = session.post(
+                api_url, json={"inputs": prompt, "parameters": parameters}, timeout=120
+            )
+            response.raise_for_status()
+            return read_generated_texts(response)
+
+        with ThreadPoolExecutor(max_workers=len(prompts)) as pool:
+            texts = [text for batch in pool.map(generate, prompts) for text in batch]
+
+    if len(texts) != len(prompts):
+        raise UnexpectedResponseError("Unexpected response format")
+    return texts
+
+def split_points(text, limit=3):
+    """Split a free-text model answer into at most ``limit`` bullet points."""
+    points = []
+    for part in POINT_SPLIT_RE.split(text):
+        part = POINT_PREFIX_RE.sub("", part).strip(" .")
+        if part:
+            points.append(part)
+    return points[:limit]
+
+def build_report(score, feedback, suggestions):
+    """Render a score and bullet lists in the report format the UI parses."""
+    feedback_lines = "\n".join(f"- {point}" for point in feedback)
+    suggestion_lines = "\n".join(f"- {point}" for point in suggestions)
+    return f"""ATS Compliance Score: {score}
+
+Feedback:
+{feedback_lines}
+
+Suggestions:
+{suggestion_lines}
+"""
+
+def has_phone_number(text):
+    """Return True if ``text`` contains a phone number.
+
+    Digit runs made up only of years, such as "2019 2020 2021", are skipped.
+    """
+    for match in PHONE_RE.finditer(text):
+        if not all(YEAR_RE.fullmatch(group) for group in NUMBER_RE.findall(match.group())):
+            return True
+    return False
+
+def local_ats_check(cv_text):
+    """Score the CV on cheap structural checks, without the model.
+
+    Returns ``(score, issues, suggestions)`` where the lists describe the
+    checks that failed.
+    """
+    found_sections = {match.group().lower() for match in SECTION_RE.finditer(cv_text)}
+    if "profile" in found_sections:
+        found_sections.add("summary")
+    word_count = len(cv_text.split())
+
+    checks = [
+        (EMAIL_RE.search(cv_text), 15, "No email address found",
+         "Add a professional email address to the contact block at the top"),
+        (has_phone_number(cv_text), 15, "No phone number found",
+         "Add a phone number to the contact block at the top"),
+        (200 <= word_count <= 1000, 15, f"CV length ({word_count} words) is outside the range ATS parsers handle best",
+         "Keep the CV to one or two pages of text"),
+        (QUANTIFIED_RE.search(cv_text), 15, "No quantified achievements found",
+         "Quantify achievements with numbers and percentages"),
+    ]
+    for section in ("experience", "education", "skills", "summary"):
+        checks.append((section in found_sections, 10, f"No '{section.title()}' section heading found",
+                       f"Add a clearly labelled '{section.title()}' section"))
+
+    score = 0
+    issues = []
+    suggestions = []
+    for passed, points, issue, suggestion in checks:
+        if passed:
+            score += points
+        else:
+            issues.append(issue)
+            suggestions.append(suggestion)
+    return score, issues, suggestions
+
 def analyze_cv(cv_text):
-    """Analyze CV text using the HF API with a more structured prompt."""
+    """Analyze CV text using the HF API with one focused prompt per section."""
     if not cv_text:
         return "Error: No text to analyze."
     
-    # Trim text if too long
-    cv_text = cv_text[:3000]
+    # Identical CVs (e.g. from the same template) skip the API entirely
+    cache = get_analysis_cache()
+    cache_key = hashlib.sha256(
+        f"{HF_MODEL_NAME}\0{PROMPT_VERSION}\0{cv_text}".encode()
+    ).hexdigest()
+    cached_report = cache.get(cache_key)
+    if cached_report is not None:
+        return cached_report
     
-    # More structured prompt with clear examples
-    prompt = f"""
-    You are an expert in Applicant Tracking Systems (ATS). 
-    
-    Please analyze this CV for ATS compatibility:
-    
-    {cv_text}
+    # The tokenizer is downloaded from the HF Hub on first use
+    try:
+        ids = get_tokenizer().encode(cv_text, add_special_tokens=False).ids
+    except Exception as e:
+        return f"Error: Could not load the model tokenizer: {str(e)}"
     
-    Respond with exactly this format:
+    # Too little text gives the model nothing to work with
+    if len(ids) < MIN_CV_TOKENS:
+        return "Error: Extracted text is too short to analyze. The PDF may be a scanned image; try a text-based PDF."
     
-    ATS Compliance Score: [a number between 0 and 100]
+    # Clearly weak CVs are reported from local checks alone
+    local_score, issues, suggestions = local_ats_check(cv_text)
+    if local_score < LOCAL_SCORE_FLOOR:
+        return build_report(local_score, issues, suggestions)
     
-    Feedback:
-    - [first specific feedback point about the CV]
-    - [second specific feedback point about the CV]
-    - [third specific feedback point about the CV]
+    # Trim text to what the model can actually read
+    cv_text = truncate_to_token_budget(cv_text, ids)
     
-    Suggestions:
-    - [first specific suggestion to improve the CV]
-    - [second specific suggestion to improve the CV]
-    - [third specific suggestion to improve the CV]
-    """
-
-    payload = {
-        "inputs": prompt,
-        "parameters": {
-            "max_length": 800,
-            "temperature": 0.1,
-            "do_sample": False,
-            "num_return_sequences": 1
-        }
-    }
+    # Short, focused prompts decode faster than one long structured answer
+    # and are batched into a single request
+    prompts = tuple(
+        f"{PROMPT_PREAMBLE}{instruction}\n\nCV:\n{cv_text}"
+        for instruction in SECTION_INSTRUCTIONS
+    )
 
     # Try API call
     try:
-        response = requests.post(API_URL, headers=headers, json=payload, timeout=45)
+        score_text, feedback_text, suggestion_text = query_model(prompts, HF_MODEL_NAME, get_api_url())
         
-        # If model is loading
-        if response.status_code == 503:
-            st.warning("Model is loading. Please wait a moment and try again.")
-            return None
-            
-        # If other error
-        if response.status_code != 200:
-            return f"Error: API returned status code {response.status_code}"
-            
-        # Try to parse response
-        result = response.json()
+        score_match = NUMBER_RE.search(score_text)
+        feedback = split_points(feedback_text)
+        suggestions = split_points(suggestion_text)
         
-        # Extract generated text
-        if isinstance(result, list) and len(result) > 0:
-            text = result[0].get("generated_text", "")
-        elif isinstance(result, dict):
-            text = result.get("generated_text", "")
-        else:
-            return "Error: Unexpected response format"
-        
-        # If we didn't get proper output, try to format it
-        if not text or "ATS Compliance Score:" not in text:
-            # Try using a fallback method - direct API call with GPT-like model
+        # If we didn't get proper output, use the template analysis
+        if not score_match or not feedback or not suggestions:
             return generate_fallback_analysis(cv_text)
             
-        # Return the generated text
-        return text
+        report = build_report(min(int(score_match.group()), 100), feedback, suggestions)
+        cache.set(cache_key, report, expire=ANALYSIS_CACHE_TTL)
+        return report
             
+    except requests.HTTPError as e:
+        return f"Error: API returned status code {e.response.status_code}"
+    except UnexpectedResponseError:
+        return "Error: Unexpected response format"
+    except requests.RequestException as e:
+        # Bad endpoint URLs, unreachable hosts and timeouts
+        return f"Error: Could not reach the inference API: {str(e)}"
     except Exception as e:
         st.error(f"API error: {str(e)}")
         return f"Error analyzing CV: {str(e)}"
 
+# Generic ATS issues and suggestions for the fallback analysis
+FALLBACK_ISSUES = (
+    "Lacks proper keyword optimization for job requirements",
+    "Format may not be compatible with all ATS systems", 
+    "Missing quantifiable achievements and results",
+    "Contact information might not be properly formatted",
+    "Inconsistent formatting throughout the document",
+    "Unusual section headings that ATS may not recognize"
+)
+FALLBACK_SUGGESTIONS = (
+    "Include relevant keywords from the job description",
+    "Use standard section headings like 'Experience', 'Education', and 'Skills'",
+    "Quantify achievements with numbers and percentages",
+    "Use a simple, clean format without tables or columns",
+    "Ensure contact information is clearly visible at the top", 
+    "Remove graphics, images, and special characters"
+)
+
+@st.cache_resource
+def get_fallback_pools():
+    """Return the fallback issues and suggestions as shuffled deques.
+
+    Built once per process; each fallback takes the next three points from a
+    pool and rotates past them, so consecutive fallbacks still vary.
+    """
+    return (
+        deque(random.sample(FALLBACK_ISSUES, len(FALLBACK_ISSUES))),
+        deque(random.sample(FALLBACK_SUGGESTIONS, len(FALLBACK_SUGGESTIONS))),
+    )
+
+def draw_points(pool, k=3):
+    """Take the next ``k`` points from a shuffled pool and rotate past them."""
+    points = [pool[i] for i in range(k)]
+    pool.rotate(-k)
+    return points
+
 def generate_fallback_analysis(cv_text):
     """Generate a fallback analysis when the primary model fails."""
     # If the main model fails, we'll just create a simple template
-    # with some generic feedback
-    
-    # Some common ATS issues to use in fallback
-    common_issues = [
-        "Lacks proper keyword optimization for job requirements",
-        "Format may not be compatible with all ATS systems", 
-        "Missing quantifiable achievements and results",
-        "Contact information might not be properly formatted",
-        "Inconsistent formatting throughout the document",
-        "Unusual section headings that ATS may not recognize"
-    ]
-    
-    # Some common ATS suggestions
-    common_suggestions = [
-        "Include relevant keywords from the job description",
-        "Use standard section headings like 'Experience', 'Education', and 'Skills'",
-        "Quantify achievements with numbers and percentages",
-        "Use a simple, clean format without tables or columns",
-        "Ensure contact information is clearly visible at the top", 
-        "Remove graphics, images, and special characters"
-    ]
-    
-    # Create a simple template with a moderate score
+    # with some generic feedback and a moderate score
     score = 65
-    
-    # Select 3 random issues and suggestions
-    import random
-    selected_issues = random.sample(common_issues, 3)
-    selected_suggestions = random.sample(common_suggestions, 3)
-    
-    analysis = f"""ATS Compliance Score: {score}
+    issue_pool, suggestion_pool = get_fallback_pools()
+    return build_report(score, draw_points(issue_pool), draw_points(suggestion_pool))
 
-Feedback:
-- {selected_issues[0]}
-- {selected_issues[1]}
-- {selected_issues[2]}
+def parse_report(analysis_text):
+    """Split a report into its score, feedback and suggestion points.
 
-Suggestions:
-- {selected_suggestions[0]}
-- {selected_suggestions[1]}
-- {selected_suggestions[2]}
-"""
-    return analysis
+    A single scan over the text handles every section, tracking which
+    header the bullets belong to.
+    """
+    score = None
+    points = {"Feedback": [], "Suggestions": []}
+    current = None
+    for match in REPORT_LINE_RE.finditer(analysis_text):
+        if match.group("score"):
+            score = int(match.group("score"))
+        elif match.group("section"):
+            current = points[match.group("section")]
+        elif current is not None:
+            current.append(match.group("bullet"))
+    return score, points["Feedback"], points["Suggestions"]
 
 def format_analysis_output(analysis_text):
     """Format the analysis output for better display."""
@@ -159,10 +459,10 @@ def format_analysis_output(analysis_text):
     formatted_output = st.container()
     
     with formatted_output:
-        # Try to extract the score
-        score_match = re.search(r"ATS Compliance Score:\s*(\d+)", analysis_text)
-        if score_match:
-            score = int(score_match.group(1))
+        score, feedback_points, suggestion_points = parse_report(analysis_text)
+        
+        # Show the score if there is one
+        if score is not None:
             st.metric("ATS Compliance Score", f"{score}/100")
             
             # Determine color based on score
@@ -175,7 +475,6 @@ def format_analysis_output(analysis_text):
         
         # Display feedback
         st.subheader("Feedback")
-        feedback_points = re.findall(r"Feedback:(?:\s*\n*)\s*-\s*([^\n]+)", analysis_text)
         if feedback_points:
             for point in feedback_points:
                 st.markdown(f"- {point.strip()}")
@@ -184,7 +483,6 @@ def format_analysis_output(analysis_text):
         
         # Display suggestions
         st.subheader("Suggestions")
-        suggestion_points = re.findall(r"Suggestions:(?:\s*\n*)\s*-\s*([^\n]+)", analysis_text)
         if suggestion_points:
             for point in suggestion_points:
                 st.markdown(f"- {point.strip()}")
@@ -193,44 +491,76 @@ def format_analysis_output(analysis_text):
     
     return formatted_output
 
-# UI Components
-st.title("ATS CV Analyzer")
-st.write("Upload your CV to check its ATS compliance")
+@st.fragment
+def analyzer_ui(uploaded_file):
+    """Analyze and preview an upload.
 
-# Upload section
-uploaded_file = st.file_uploader("Upload your CV (PDF format)", type=["pdf"])
+    Runs as a fragment so its buttons and checkbox rerun only this block,
+    not the whole script.
+    """
+    # Snapshot the upload once; both extraction calls reuse the same bytes
+    pdf_bytes = uploaded_file.getvalue()
 
-if uploaded_file:
     # Extract text button
     if st.button("Analyze CV"):
         # Extract text
         with st.spinner("Extracting text from PDF..."):
-            cv_text = extract_text_from_pdf(uploaded_file)
-            
+            cv_text = extract_text_from_pdf(pdf_bytes)
+        
         if cv_text:
             # Analyze the CV
             with st.spinner("Analyzing CV..."):
                 analysis = analyze_cv(cv_text)
-            
+        
             # Display formatted results
             if analysis:
                 st.subheader("Analysis Results")
                 format_analysis_output(analysis)
-                
+            
                 # Also show raw output for debugging
                 with st.expander("View Raw Analysis"):
                     st.text(analysis)
         else:
             st.error("Could not extract text from the PDF. Please try a different file.")
-            
+        
     # Option to view extracted text
     if st.checkbox("View extracted text"):
-        text = extract_text_from_pdf(uploaded_file)
+        text = extract_text_from_pdf(pdf_bytes)
         if text:
             st.text_area("Extracted text", text, height=200)
         else:
             st.error("Could not extract text from the PDF.")
 
+def main():
+    """Render the analyzer UI."""
+    # Set page config
+    st.set_page_config(page_title="ATS CV Analyzer", page_icon="📄")
+
+    # Every request would just come back 401, so don't start without a token
+    if not get_api_token():
+        st.error("HF_API_TOKEN not configured. Add it to the app's secrets.")
+        st.stop()
+
+    # Start loading the model as soon as a visitor opens the app
+    if "warmed" not in st.session_state:
+        st.session_state["warmed"] = True
+        start_warm_up()
+
+    st.title("ATS CV Analyzer")
+    st.write("Upload your CV to check its ATS compliance")
+
+    # Upload section
+    uploaded_file = st.file_uploader("Upload your CV (PDF format)", type=["pdf"])
+
+    if uploaded_file:
+        # Warm again on each new upload in case the model was unloaded while
+        # the page sat idle
+        if st.session_state.get("warmed_file_id") != uploaded_file.file_id:
+            st.session_state["warmed_file_id"] = uploaded_file.file_id
+            start_warm_up()
+
+        analyzer_ui(uploaded_file)
+
 # # Add a quick test option
 # if st.checkbox("Test with sample CV"):
 #     sample_text = """
@@ -263,3 +593,6 @@ if uploaded_file:
 #         if test_result:
 #             st.subheader("Test Analysis Result")
 #             format_analysis_output(test_result)
+
+if __name__ == "__main__":
+    main()
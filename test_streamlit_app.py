@@ -0,0 +1,145 @@
+import pymupdf
+import pytest
+
+import streamlit_app
+from streamlit_app import clean_text, extract_text_from_pdf, local_ats_check
+
+# A typical CV as it comes out of extract_text_from_pdf: whitespace collapsed
+# onto a single line, with date ranges on every role
+SAMPLE_CV = clean_text("""
+John Doe
+Software Engineer
+123 Main St, City, State
+Phone: 555-123-4567
+Email: john@example.com
+
+SUMMARY
+Backend engineer with 8 years of experience building web services.
+
+EXPERIENCE
+Senior Developer, XYZ Corp (2018-2021)
+- Led development of the company's flagship product, growing revenue by 25%
+- Managed a team of 5 junior developers
+
+Developer, ABC Inc (2015 - 2018)
+- Developed web applications using React
+
+EDUCATION
+BS Computer Science, State University (2011-2015)
+
+SKILLS
+Programming: JavaScript, Python, Java
+Tools: Git, Docker, AWS
+""")
+
+
+def test_local_ats_check_passes_contact_and_headings():
+    _, issues, _ = local_ats_check(SAMPLE_CV)
+
+    assert "No email address found" not in issues
+    assert "No phone number found" not in issues
+    assert "No quantified achievements found" not in issues
+    assert not [issue for issue in issues if "section heading" in issue]
+
+
+@pytest.mark.parametrize("text, section", [
+    ("EDUCATION 2011-2015 BS Computer Science", "Education"),
+    ("Work Experience 2018-2021 Senior Developer", "Experience"),
+    ("SKILLS python, java", "Skills"),
+    ("Tools and Skills", "Skills"),
+])
+def test_local_ats_check_recognises_heading_layouts(text, section):
+    _, issues, _ = local_ats_check(text)
+
+    assert f"No '{section}' section heading found" not in issues
+
+
+def test_local_ats_check_ignores_year_ranges_as_phone_numbers():
+    cv_text = SAMPLE_CV.replace("Phone: 555-123-4567 ", "")
+
+    score, issues, _ = local_ats_check(cv_text)
+
+    assert "No phone number found" in issues
+    assert score == local_ats_check(SAMPLE_CV)[0] - 15
+
+
+def test_local_ats_check_ignores_heading_words_in_prose():
+    cv_text = clean_text("""
+    Jane Roe, jane@example.com, 555-987-6543.
+    I have 6 years of experience in finance and a strong education in economics.
+    """)
+
+    _, issues, _ = local_ats_check(cv_text)
+
+    assert "No 'Experience' section heading found" in issues
+    assert "No 'Education' section heading found" in issues
+
+
+class _WordTokenizer:
+    """Offline stand-in that treats each word as one token."""
+
+    def encode(self, text, add_special_tokens=True):
+        class Encoding:
+            ids = list(range(len(text.split())))
+        return Encoding()
+
+
+def test_analyze_cv_reports_bad_endpoint_url(monkeypatch):
+    monkeypatch.setattr(streamlit_app, "get_api_url", lambda: "my-endpoint.example.com/generate")
+    monkeypatch.setattr(streamlit_app, "get_tokenizer", lambda: _WordTokenizer())
+    monkeypatch.setattr(streamlit_app, "get_cv_token_budget", lambda: 400)
+    monkeypatch.setattr(streamlit_app, "get_analysis_cache", lambda: {})
+
+    result = streamlit_app.analyze_cv(SAMPLE_CV)
+
+    assert result.startswith("Error: Could not reach the inference API")
+    assert "Unexpected response format" not in result
+
+
+class _RecordingSession:
+    """Fake session that answers every request like a TGI endpoint."""
+
+    def __init__(self):
+        self.payloads = []
+
+    def post(self, url, json, timeout):
+        self.payloads.append(json)
+
+        class Response:
+            content = b'{"generated_text": "ok"}'
+
+            def raise_for_status(self):
+                pass
+
+        return Response()
+
+
+def test_query_model_sends_string_inputs_to_dedicated_endpoint(monkeypatch):
+    session = _RecordingSession()
+    monkeypatch.setattr(streamlit_app, "get_session", lambda: session)
+    prompts = ("score prompt", "feedback prompt", "suggestion prompt")
+
+    texts = streamlit_app.query_model(prompts, "test-model", "http://localhost:8080/generate")
+
+    assert texts == ["ok", "ok", "ok"]
+    assert sorted(payload["inputs"] for payload in session.payloads) == sorted(prompts)
+
+
+def test_extract_text_from_pdf_separates_pages():
+    doc = pymupdf.open()
+    doc.new_page().insert_text((72, 72), "Developer, ABC Inc 2015")
+    doc.new_page().insert_text((72, 72), "EDUCATION BS Computer Science")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+
+    text = extract_text_from_pdf(pdf_bytes)
+
+    assert text == "Developer, ABC Inc 2015 EDUCATION BS Computer Science"
+
+
+def test_session_retries_plain_http_endpoints_but_not_read_timeouts():
+    for url in ("http://localhost:8080/generate", streamlit_app.DEFAULT_API_URL):
+        retry = streamlit_app.get_session().get_adapter(url).max_retries
+
+        assert retry.status == 3
+        assert retry.read is False